@@ -1,26 +1,138 @@
+import re
+from collections.abc import MutableMapping
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
 import networkx as nx
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.transforms import Bbox
 import numpy as np
 
 
+TOKEN_DTYPE = np.int16
+TOKEN_MIN = int(np.iinfo(TOKEN_DTYPE).min)
+TOKEN_MAX = int(np.iinfo(TOKEN_DTYPE).max)
+
+# A node name: no ',', '=' or '>', no surrounding whitespace (inner spaces are fine)
+_NAME = r'[^,=>\s](?:[^,=>]*[^,=>\s])?'
+# One findall scans a whole field: each non-blank comma-separated item yields its
+# groups, or ('', '') when the item does not parse
+_ARC_RE = re.compile(rf'[\s,]*(?:({_NAME})\s*->\s*({_NAME})(?=\s*(?:,|\Z))|[^,]*[^,\s])')
+_MARK_RE = re.compile(rf'[\s,]*(?:({_NAME})\s*=\s*(-?\d+)(?=\s*(?:,|\Z))|[^,]*[^,\s])')
+
+
+def _parse_items(pattern, text):
+    items = pattern.findall(text)
+    if ('', '') in items:
+        bad = [item.strip() for item in text.split(',') if item.strip()][items.index(('', ''))]
+        raise ValueError(f"could not parse '{bad}'")
+    return items
+
+
+def _parse_names(text):
+    # Same grammar as _NAME; plain split/strip is faster than any regex scan here
+    names = [name.strip() for name in text.split(',') if name.strip()]
+    if '=' in text or '>' in text:
+        bad = next(name for name in names if '=' in name or '>' in name)
+        raise ValueError(f"could not parse '{bad}'")
+    return names
+
+
+def _pack_arcs(arc_maps, place_idx):
+    # CSR layout: row r's arcs are idx[off[r]:off[r + 1]] with weights w[off[r]:off[r + 1]]
+    off = np.zeros(len(arc_maps) + 1, dtype=np.int32)
+    np.cumsum([len(arcs) for arcs in arc_maps], out=off[1:])
+    idx = np.fromiter((place_idx[name] for arcs in arc_maps for name in arcs),
+                      dtype=np.int32, count=off[-1])
+    w = np.fromiter((weight for arcs in arc_maps for weight in arcs.values()),
+                    dtype=TOKEN_DTYPE, count=off[-1])
+    return off, idx, w
+
+
+def _enabled_mask(tokens, in_off, in_idx, in_w):
+    # AND-reduce each transition's row of input checks; rows without input arcs stay enabled
+    mask = np.ones(len(in_off) - 1, dtype=bool)
+    rows = np.flatnonzero(np.diff(in_off))
+    if rows.size:
+        mask[rows] = np.logical_and.reduceat(tokens[in_idx] >= in_w, in_off[rows])
+    return mask
+
+
+def _arc_totals(fired, off, idx, w, size):
+    # Per-place sum of arc weights over the fired transition rows
+    per_arc = np.repeat(fired, np.diff(off))
+    return np.bincount(idx, weights=w * per_arc, minlength=size).astype(np.int64)
+
+
+def _edge_geometry(starts, ends, shrink_start, shrink_end, head_length=0.06, head_width=0.03):
+    # Shorten each segment to the node borders and build one arrowhead triangle per edge
+    vec = ends - starts
+    length = np.maximum(np.hypot(vec[:, 0], vec[:, 1]), 1e-9)
+    unit = vec / length[:, None]
+    normal = unit[:, ::-1] * (-1, 1)
+    tails = starts + unit * shrink_start[:, None]
+    tips = ends - unit * shrink_end[:, None]
+    bases = tips - unit * head_length
+    segments = np.stack([tails, bases], axis=1)
+    heads = np.stack([tips, bases + normal * head_width, bases - normal * head_width], axis=1)
+    return segments, heads
+
+
 class Place:
-    def __init__(self, name, tokens=0):
+    __slots__ = ('name', '_net', '_idx')
+
+    # A named view onto one row of the owning net's marking vector
+    def __init__(self, name, net, idx):
         self.name = name
-        self.tokens = tokens
+        self._net = net
+        self._idx = idx
+
+    @property
+    def tokens(self):
+        return int(self._net.marking[self._idx])
+
+    @tokens.setter
+    def tokens(self, value):
+        self._net.marking[self._idx] = value
 
     def __repr__(self):
         return f"Place({self.name}, tokens={self.tokens})"
 
 
+class _PosView(MutableMapping):
+    __slots__ = ('_net',)
+
+    # name -> (2,) row view of the owning net's position array; writes go straight into it
+    def __init__(self, net):
+        self._net = net
+
+    def __getitem__(self, name):
+        return self._net.position_array[self._net._pos_idx[name]]
+
+    def __setitem__(self, name, xy):
+        self._net.set_position(name, xy)
+
+    def __delitem__(self, name):
+        raise TypeError("node positions cannot be removed")
+
+    def __iter__(self):
+        return iter(self._net.node_names)
+
+    def __len__(self):
+        return len(self._net.node_names)
+
+
 class Transition:
+    __slots__ = ('name', 'input_arcs', 'output_arcs', 'in_idx', 'in_w')
+
     def __init__(self, name):
         self.name = name
         self.input_arcs = {}
         self.output_arcs = {}
+        # Packed (place index, weight) columns, filled in by PetriNet.finalize()
+        self.in_idx = np.empty(0, dtype=np.int32)
+        self.in_w = np.empty(0, dtype=TOKEN_DTYPE)
 
     def add_input_arc(self, place, weight):
         self.input_arcs[place.name] = weight
@@ -28,8 +140,8 @@ class Transition:
     def add_output_arc(self, place, weight):
         self.output_arcs[place.name] = weight
 
-    def is_enabled(self, places):
-        return all(places[name].tokens >= weight for name, weight in self.input_arcs.items())
+    def is_enabled(self, tokens):
+        return bool(np.all(np.take(tokens, self.in_idx) >= self.in_w))
 
 
 class PetriNet:
@@ -37,36 +149,243 @@ class PetriNet:
         self.places = {}
         self.transitions = {}
         self.arcs = []
-        self.pos = {}
+        # Node positions live in one (N, 2) array; row order follows node_names and
+        # the buffer doubles when it fills up
+        self.node_names = []
+        self._pos_idx = {}
+        self._pos_buf = np.zeros((8, 2))
+        self._rng = np.random.default_rng(0)
+        # Token counts indexed by place row; the buffer doubles when it fills up
+        self._place_idx = {}
+        self._marking_buf = np.zeros(8, dtype=TOKEN_DTYPE)
+        self._arrays_dirty = True
+        self._G = None
+        self._G_dirty = True
+        self._place_nodes_cache = None
+        self._transition_nodes_cache = None
 
     def add_place(self, name, tokens=0):
-        self.places[name] = Place(name, tokens)
-        self.pos[name] = np.random.rand(2) * 2 - 1
+        if not TOKEN_MIN <= tokens <= TOKEN_MAX:
+            raise ValueError(f"{name} has {tokens} tokens, the range is {TOKEN_MIN}..{TOKEN_MAX}")
+        if name not in self._place_idx:
+            if len(self._place_idx) == len(self._marking_buf):
+                self._marking_buf = np.concatenate([self._marking_buf, np.zeros_like(self._marking_buf)])
+            self._place_idx[name] = len(self._place_idx)
+        self._marking_buf[self._place_idx[name]] = tokens
+        self.places[name] = Place(name, self, self._place_idx[name])
+        self._init_positions([name])
+        self._place_nodes_cache = None
+        self._arrays_dirty = True
+        self._G_dirty = True
 
     def add_transition(self, name):
         self.transitions[name] = Transition(name)
-        self.pos[name] = np.random.rand(2) * 2 - 1
+        self._init_positions([name])
+        self._transition_nodes_cache = None
+        self._arrays_dirty = True
+        self._G_dirty = True
 
     def add_arc(self, source, target, weight=1):
-        self.arcs.append((source, target, weight))
+        if weight > TOKEN_MAX:
+            raise ValueError(f"arc {source}->{target} has weight {weight}, the maximum is {TOKEN_MAX}")
         if source in self.places and target in self.transitions:
             self.transitions[target].add_input_arc(self.places[source], weight)
         elif source in self.transitions and target in self.places:
             self.transitions[source].add_output_arc(self.places[target], weight)
+        else:
+            raise ValueError(f"invalid arc {source}->{target}")
+        self.arcs.append((source, target, weight))
+        self._arrays_dirty = True
+        self._G_dirty = True
+
+    def bulk_add(self, places=(), transitions=(), arcs=(), markings=None):
+        markings = markings or {}
+        places = list(places)
+        transitions = list(transitions)
+        tokens = np.fromiter((markings.get(name, 0) for name in places), dtype=np.int64,
+                             count=len(places))
+        bad = np.flatnonzero((tokens < TOKEN_MIN) | (tokens > TOKEN_MAX))
+        if bad.size:
+            name = places[bad[0]]
+            raise ValueError(f"{name} has {tokens[bad[0]]} tokens, the range is {TOKEN_MIN}..{TOKEN_MAX}")
+        # Size the marking buffer for the whole batch up front instead of doubling per place
+        count = len(self._place_idx)
+        for name in places:
+            self._place_idx.setdefault(name, len(self._place_idx))
+        if len(self._place_idx) > len(self._marking_buf):
+            buf = np.zeros(len(self._place_idx), dtype=TOKEN_DTYPE)
+            buf[:count] = self._marking_buf[:count]
+            self._marking_buf = buf
+        rows = [self._place_idx[name] for name in places]
+        self._marking_buf[rows] = tokens
+        for name, row in zip(places, rows):
+            self.places[name] = Place(name, self, row)
+        for name in transitions:
+            self.transitions[name] = Transition(name)
+        self._init_positions(places + transitions)
+        self._place_nodes_cache = None
+        self._transition_nodes_cache = None
+        self._arrays_dirty = True
+        self._G_dirty = True
+        for arc in arcs:
+            self.add_arc(*arc)
+
+    @property
+    def place_nodes(self):
+        if self._place_nodes_cache is None:
+            self._place_nodes_cache = list(self.places)
+        return self._place_nodes_cache
+
+    @property
+    def transition_nodes(self):
+        if self._transition_nodes_cache is None:
+            self._transition_nodes_cache = list(self.transitions)
+        return self._transition_nodes_cache
+
+    def _init_positions(self, names):
+        # One random draw for the whole batch; new names get rows appended in order
+        count = len(self.node_names)
+        rows = []
+        for name in names:
+            if name not in self._pos_idx:
+                self._pos_idx[name] = len(self.node_names)
+                self.node_names.append(name)
+            rows.append(self._pos_idx[name])
+        if len(self.node_names) > len(self._pos_buf):
+            buf = np.zeros((max(len(self.node_names), 2 * len(self._pos_buf)), 2))
+            buf[:count] = self._pos_buf[:count]
+            self._pos_buf = buf
+        self._pos_buf[rows] = self._rng.random((len(rows), 2)) * 2 - 1
+
+    @property
+    def pos(self):
+        return _PosView(self)
+
+    @property
+    def position_array(self):
+        return self._pos_buf[:len(self.node_names)]
+
+    def node_rows(self, names):
+        return np.array([self._pos_idx[name] for name in names], dtype=np.intp)
+
+    def positions(self, names):
+        return self._pos_buf[self.node_rows(names)]
+
+    def set_position(self, name, pos):
+        # The cached graph holds row views of the array, so it sees this write too
+        self._pos_buf[self._pos_idx[name]] = pos
+
+    def auto_layout(self, seed=42, iterations=50):
+        # Fruchterman-Reingold on the position array: attraction over the arc index arrays,
+        # repulsion over all pairs in row blocks so memory stays O(block * N)
+        n = len(self.node_names)
+        if n == 0:
+            return
+        pos = np.random.default_rng(seed).random((n, 2))
+        src = self.node_rows([src for src, _, _ in self.arcs])
+        dst = self.node_rows([dst for _, dst, _ in self.arcs])
+        k2 = 1.0 / n
+        block = max(1, 2 ** 20 // n)
+        temperature = 0.1
+        cooling = temperature / (iterations + 1)
+        for _ in range(iterations):
+            disp = np.zeros((n, 2))
+            for start in range(0, n, block):
+                delta = pos[start:start + block, None, :] - pos[None, :, :]
+                dist2 = np.maximum(np.einsum('ijk,ijk->ij', delta, delta), 1e-4)
+                disp[start:start + block] += np.einsum('ijk,ij->ik', delta, k2 / dist2)
+            delta = pos[src] - pos[dst]
+            pull = delta * (np.hypot(delta[:, 0], delta[:, 1]) / np.sqrt(k2))[:, None]
+            np.subtract.at(disp, src, pull)
+            np.add.at(disp, dst, pull)
+            length = np.maximum(np.hypot(disp[:, 0], disp[:, 1]), 1e-9)
+            pos += disp * (np.minimum(length, temperature) / length)[:, None]
+            temperature -= cooling
+        pos -= pos.mean(axis=0)
+        extent = np.abs(pos).max()
+        self.position_array[:] = pos / extent if extent > 0 else pos
 
     def get_networkx_graph(self):
+        if not self._G_dirty:
+            return self._G
         G = nx.DiGraph()
-        for node, pos in self.pos.items():
-            G.add_node(node, pos=pos)
+        for node, row in self._pos_idx.items():
+            G.add_node(node, pos=self._pos_buf[row])
         for src, dst, weight in self.arcs:
             G.add_edge(src, dst, weight=weight)
+        self._G = G
+        self._G_dirty = False
         return G
 
+    @property
+    def marking(self):
+        return self._marking_buf[:len(self._place_idx)]
+
     def is_bounded(self):
-        return all(p.tokens >= 0 for p in self.places.values())
+        return bool((self.marking >= 0).all())
+
+    def _rebuild_arrays(self):
+        # Pre/post incidence packed as CSR rows per transition, indexed like marking
+        self._transition_rows = list(self.transitions.values())
+        self._in_off, self._in_idx, self._in_w = _pack_arcs(
+            [t.input_arcs for t in self._transition_rows], self._place_idx)
+        self._out_off, self._out_idx, self._out_w = _pack_arcs(
+            [t.output_arcs for t in self._transition_rows], self._place_idx)
+        for row, t in enumerate(self._transition_rows):
+            start, stop = self._in_off[row], self._in_off[row + 1]
+            t.in_idx = self._in_idx[start:stop]
+            t.in_w = self._in_w[start:stop]
+        self._live_hint = None
+        self._arrays_dirty = False
+
+    def finalize(self):
+        if self._arrays_dirty:
+            self._rebuild_arrays()
+        return self.marking
+
+    def enabled_mask(self):
+        tokens = self.finalize()
+        return _enabled_mask(tokens, self._in_off, self._in_idx, self._in_w)
 
     def has_live_transitions(self):
-        return any(t.is_enabled(self.places) for t in self.transitions.values())
+        tokens = self.finalize()
+        # The transition found enabled last time usually still is; test it before a full sweep
+        if self._live_hint is not None and self._transition_rows[self._live_hint].is_enabled(tokens):
+            return True
+        mask = self.enabled_mask()
+        if not mask.any():
+            return False
+        self._live_hint = int(mask.argmax())
+        return True
+
+    def step(self, n=1):
+        # Each round fires every transition enabled at its start; when candidates compete
+        # for the same tokens they fire in row order while the inputs last
+        tokens = self.finalize()
+        total = 0
+        for _ in range(n):
+            fired = _enabled_mask(tokens, self._in_off, self._in_idx, self._in_w)
+            if not fired.any():
+                break
+            consumed = _arc_totals(fired, self._in_off, self._in_idx, self._in_w, len(tokens))
+            if (consumed > tokens).any():
+                available = tokens.astype(np.int64)
+                for row in np.flatnonzero(fired):
+                    start, stop = self._in_off[row], self._in_off[row + 1]
+                    idx, w = self._in_idx[start:stop], self._in_w[start:stop]
+                    if (available[idx] >= w).all():
+                        available[idx] -= w
+                    else:
+                        fired[row] = False
+                consumed = tokens - available
+            produced = _arc_totals(fired, self._out_off, self._out_idx, self._out_w, len(tokens))
+            new = tokens - consumed + produced
+            if new.size and new.max() > TOKEN_MAX:
+                place = list(self._place_idx)[int(new.argmax())]
+                raise ValueError(f"{place} would hold {new.max()} tokens, the maximum is {TOKEN_MAX}")
+            tokens[:] = new
+            total += int(fired.sum())
+        return total
 
 
 class MinimalisticTheme:
@@ -86,12 +405,23 @@ class MinimalisticTheme:
     GRAPH_BG = "#f8f9fa"
     EDGE_COLOR = "#adb5bd"
 
+    # Shared by the panel's action buttons
+    BUTTON_STYLE = {"bg": ACCENT, "fg": "white", "relief": tk.FLAT, "bd": 0,
+                    "padx": 0, "pady": 5, "font": ("Arial", 10)}
+
 
 class PetriNetApp:
+    PLACE_SIZE = 800
+    TRANSITION_SIZE = 0.12
+    PLACE_RADIUS = 0.09
+
     def __init__(self, root):
         self.root = root
         self.petri_net = PetriNet()
         self.dragging = None
+        self._pending_motion = None
+        self._motion_job = None
+        self._analysis_window = None
         self.setup_ui()
         self.setup_graph()
 
@@ -117,7 +447,7 @@ class PetriNetApp:
         self.setup_input_panel()
         
         # Create canvas for network visualization
-        self.figure = plt.figure(figsize=(8, 6), facecolor=MinimalisticTheme.GRAPH_BG)
+        self.figure = Figure(figsize=(8, 6), facecolor=MinimalisticTheme.GRAPH_BG)
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.viz_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -156,19 +486,13 @@ class PetriNetApp:
         
         # Action buttons
         tk.Button(btn_frame, text="Generate", command=self.generate_network,
-                bg=MinimalisticTheme.ACCENT, fg="white",
-                relief=tk.FLAT, bd=0, padx=0, pady=5,
-                font=("Arial", 10)).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+                **MinimalisticTheme.BUTTON_STYLE).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
                 
         tk.Button(btn_frame, text="Analyze", command=self.analyze_net,
-                bg=MinimalisticTheme.ACCENT, fg="white",
-                relief=tk.FLAT, bd=0, padx=0, pady=5,
-                font=("Arial", 10)).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+                **MinimalisticTheme.BUTTON_STYLE).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
                 
         tk.Button(btn_frame, text="Reset", command=self.reset_model,
-                bg=MinimalisticTheme.ACCENT, fg="white",
-                relief=tk.FLAT, bd=0, padx=0, pady=5,
-                font=("Arial", 10)).pack(side=tk.LEFT, fill=tk.X, expand=True)
+                **MinimalisticTheme.BUTTON_STYLE).pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         # Help text
         help_frame = tk.Frame(self.input_frame, bg=MinimalisticTheme.BG)
@@ -191,77 +515,240 @@ class PetriNetApp:
         self.ax.set_facecolor(MinimalisticTheme.GRAPH_BG)
         self.ax.set_xticks([])
         self.ax.set_yticks([])
+        self.ax.set_xlim(-1.5, 1.5)
+        self.ax.set_ylim(-1.5, 1.5)
+        self._bg = None
+        self._drag_artists = []
+        self._label_artists = {}
+        self._token_artists = {}
+        self._setup_scene()
+        self._setup_drag_overlay()
         self._draw_network()
+        self._setup_dragging()
+
+    def _setup_scene(self):
+        # Persistent artists; redraws only update their data
+        self._edge_collection = LineCollection([], colors=MinimalisticTheme.EDGE_COLOR,
+                                               linewidths=1.5, zorder=1)
+        self._arrow_collection = PolyCollection([], facecolors=MinimalisticTheme.EDGE_COLOR,
+                                                edgecolors="none", zorder=1)
+        self.ax.add_collection(self._edge_collection)
+        self.ax.add_collection(self._arrow_collection)
+        self._place_artist = self.ax.scatter([], [], s=self.PLACE_SIZE,
+                                             c=MinimalisticTheme.PLACE_COLOR,
+                                             edgecolors="#ffffff", linewidths=1, zorder=2)
+        # Transitions are squares stored as (T, 4, 2) corner arrays: centre + _square
+        half = self.TRANSITION_SIZE / 2
+        self._square = np.array([(-half, -half), (half, -half), (half, half), (-half, half)])
+        self._transition_artist = PolyCollection([], facecolors=MinimalisticTheme.TRANSITION_COLOR,
+                                                 edgecolors="#ffffff",
+                                                 linewidths=1, zorder=2)
+        self.ax.add_collection(self._transition_artist)
 
     def _draw_network(self):
-        self.ax.clear()
         G = self.petri_net.get_networkx_graph()
         
-        pos = nx.get_node_attributes(G, 'pos')
+        pos = self.petri_net.pos
         
-        # Draw edges
-        for edge in G.edges():
-            nx.draw_networkx_edges(G, pos, edgelist=[edge], ax=self.ax,
-                                  edge_color=MinimalisticTheme.EDGE_COLOR, width=1.5,
-                                  arrowsize=15, arrowstyle='->')
+        # Update edges
+        self._index_edges(list(G.edges()))
+        self._set_edges(self._edge_collection, self._arrow_collection, slice(None))
         
-        # Draw nodes
-        place_nodes = [node for node in G.nodes() if node in self.petri_net.places]
-        transition_nodes = [node for node in G.nodes() if node in self.petri_net.transitions]
+        # Update nodes
+        place_nodes = self.petri_net.place_nodes
+        transition_nodes = self.petri_net.transition_nodes
         
-        # Draw places (circular)
-        nx.draw_networkx_nodes(G, pos, nodelist=place_nodes, ax=self.ax,
-                              node_color=MinimalisticTheme.PLACE_COLOR,
-                              node_size=800,
-                              edgecolors="#ffffff", linewidths=1)
+        # Update places (circular)
+        self._place_rows = {node: i for i, node in enumerate(place_nodes)}
+        self._place_artist.set_offsets(self.petri_net.positions(place_nodes))
+        self._place_artist.set_sizes([self.PLACE_SIZE])
         
-        # Draw transitions (square)
-        for node in transition_nodes:
-            x, y = pos[node]
-            square_size = 0.12
-            square = plt.Rectangle((x - square_size / 2, y - square_size / 2),
-                                  square_size, square_size,
-                                  facecolor=MinimalisticTheme.TRANSITION_COLOR,
-                                  edgecolor="#ffffff",
-                                  linewidth=1, zorder=2)
-            self.ax.add_patch(square)
+        # Update transitions (square)
+        self._transition_rows = {node: i for i, node in enumerate(transition_nodes)}
+        self._transition_verts = (self.petri_net.positions(transition_nodes)[:, None, :]
+                                  + self._square)
+        self._transition_artist.set_verts(self._transition_verts)
         
-        # Draw token counts inside places
-        for node in place_nodes:
-            x, y = pos[node]
-            tokens = self.petri_net.places[node].tokens
-            if tokens > 0:
-                self.ax.text(x, y, str(tokens),
-                            fontsize=9, color="#ffffff",
-                            ha='center', va='center', fontweight='bold')
+        # Update token counts inside places and labels
+        self._sync_text_artists(pos)
         
-        # Draw labels
-        nx.draw_networkx_labels(G, pos, ax=self.ax, font_color=MinimalisticTheme.FG,
-                               font_size=9, font_family="Arial")
+        self.canvas.draw_idle()
+
+    def _sync_text_artists(self, pos):
+        places = self.petri_net.places
+        for node in [node for node in self._label_artists if node not in pos]:
+            self._label_artists.pop(node).remove()
+        for node in [node for node in self._token_artists if node not in places]:
+            self._token_artists.pop(node).remove()
         
-        self.ax.set_xlim(-1.5, 1.5)
-        self.ax.set_ylim(-1.5, 1.5)
+        for node, xy in pos.items():
+            if node not in self._label_artists:
+                self._label_artists[node] = self.ax.text(0, 0, node,
+                            fontsize=9, color=MinimalisticTheme.FG, family="Arial",
+                            ha='center', va='center', clip_on=True)
+            self._label_artists[node].set_position(xy)
         
+        for node, place in places.items():
+            if node not in self._token_artists:
+                self._token_artists[node] = self.ax.text(0, 0, "",
+                            fontsize=9, color="#ffffff",
+                            ha='center', va='center', fontweight='bold')
+            token = self._token_artists[node]
+            token.set_position(pos[node])
+            token.set_text(str(place.tokens))
+            token.set_visible(place.tokens > 0)
+
+    def _index_edges(self, edges):
+        # Endpoint rows and border offsets per arc, so geometry updates are pure array gathers
+        places = self.petri_net.places
+        radius = {node: self.PLACE_RADIUS if node in places else self.TRANSITION_SIZE / 2
+                  for edge in edges for node in edge}
+        self._edges = edges
+        self._edge_src = self.petri_net.node_rows([src for src, _ in edges])
+        self._edge_dst = self.petri_net.node_rows([dst for _, dst in edges])
+        self._edge_shrink = np.array([(radius[src], radius[dst]) for src, dst in edges],
+                                     dtype=float).reshape(-1, 2)
+
+    def _set_edges(self, lines, arrows, which):
+        points = self.petri_net.position_array
+        segments, heads = _edge_geometry(points[self._edge_src[which]], points[self._edge_dst[which]],
+                                         self._edge_shrink[which, 0], self._edge_shrink[which, 1])
+        lines.set_segments(segments)
+        arrows.set_verts(heads)
+
+    def _setup_drag_overlay(self):
+        # Animated stand-ins for the dragged node and its arcs; never part of a full draw
+        self._drag_lines = LineCollection([], colors=MinimalisticTheme.EDGE_COLOR,
+                                          linewidths=1.5, zorder=1, animated=True)
+        self._drag_arrows = PolyCollection([], facecolors=MinimalisticTheme.EDGE_COLOR,
+                                           edgecolors="none", zorder=1, animated=True)
+        self.ax.add_collection(self._drag_lines)
+        self.ax.add_collection(self._drag_arrows)
+        self._drag_place = self.ax.scatter([], [], s=self.PLACE_SIZE, c=MinimalisticTheme.PLACE_COLOR,
+                                           edgecolors="#ffffff", linewidths=1,
+                                           zorder=2, animated=True)
+        self._drag_transition = PolyCollection([], facecolors=MinimalisticTheme.TRANSITION_COLOR,
+                                               edgecolors="#ffffff", linewidths=1,
+                                               zorder=2, animated=True)
+        self.ax.add_collection(self._drag_transition)
+        self._drag_edges = np.zeros(0, dtype=bool)
+        self._drag_texts = []
+        self._drag_extent = None
+
+    def _begin_drag(self, node):
+        # Take the node and its arcs out of the static scene, render that once and
+        # cache it; motion then only repaints the overlay's dirty rectangle
+        row = self.petri_net.node_rows([node])[0]
+        self._drag_edges = (self._edge_src == row) | (self._edge_dst == row)
+        self._set_edges(self._edge_collection, self._arrow_collection, ~self._drag_edges)
+        self._drag_artists = [self._drag_lines, self._drag_arrows]
+        if node in self._place_rows:
+            sizes = np.full(len(self._place_rows), float(self.PLACE_SIZE))
+            sizes[self._place_rows[node]] = 0
+            self._place_artist.set_sizes(sizes)
+            self._drag_artists.append(self._drag_place)
+        if node in self._transition_rows:
+            self._transition_artist.set_verts(
+                np.delete(self._transition_verts, self._transition_rows[node], axis=0))
+            self._drag_artists.append(self._drag_transition)
+        self._drag_texts = [self._label_artists[node]]
+        if node in self._token_artists:
+            self._drag_texts.append(self._token_artists[node])
+        for text in self._drag_texts:
+            text.set_animated(True)
+        self._drag_artists.extend(self._drag_texts)
         self.canvas.draw()
-        self._setup_dragging()
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._drag_extent = None
+        self._move_drag(node, *self.petri_net.positions([node])[0])
+
+    def _move_drag(self, node, x, y):
+        self.petri_net.set_position(node, (x, y))
+        if self._drag_place in self._drag_artists:
+            self._drag_place.set_offsets([(x, y)])
+        if self._drag_transition in self._drag_artists:
+            self._drag_transition.set_verts([self._square + (x, y)])
+        if node in self._token_artists:
+            self._token_artists[node].set_position((x, y))
+        self._label_artists[node].set_position((x, y))
+        self._set_edges(self._drag_lines, self._drag_arrows, self._drag_edges)
+        self._blit_drag()
+
+    def _blit_drag(self):
+        self.canvas.restore_region(self._bg)
+        for artist in self._drag_artists:
+            self.ax.draw_artist(artist)
+        # Push only the area covered by the overlay now or on the previous frame
+        rows = np.concatenate([self.petri_net.node_rows([self.dragging]),
+                               self._edge_src[self._drag_edges], self._edge_dst[self._drag_edges]])
+        corners = self.ax.transData.transform(self.petri_net.position_array[rows])
+        margin = np.sqrt(self.PLACE_SIZE) / 2 * self.figure.dpi / 72 + 2
+        extent = Bbox([corners.min(axis=0), corners.max(axis=0)]).padded(margin)
+        # Labels can reach well past the node marker
+        extent = Bbox.union([extent] + [text.get_window_extent().padded(2)
+                                        for text in self._drag_texts])
+        dirty = extent if self._drag_extent is None else Bbox.union([extent, self._drag_extent])
+        self._drag_extent = extent
+        dirty = Bbox.intersection(dirty, self.ax.bbox)
+        if dirty is not None:
+            self.canvas.blit(dirty)
+
+    def _flush_motion(self):
+        self._motion_job = None
+        if self.dragging and self._pending_motion is not None:
+            self._move_drag(self.dragging, *self._pending_motion)
+        self._pending_motion = None
+
+    def _end_drag(self, node):
+        # Topology is unchanged: put the node and its arcs back into the static
+        # collections instead of running the full _draw_network
+        self._set_edges(self._edge_collection, self._arrow_collection, slice(None))
+        if node in self._place_rows:
+            self._place_artist.set_offsets(self.petri_net.positions(self.petri_net.place_nodes))
+            self._place_artist.set_sizes([self.PLACE_SIZE])
+        if node in self._transition_rows:
+            self._transition_verts[self._transition_rows[node]] = (
+                self._square + self.petri_net.positions([node])[0])
+            self._transition_artist.set_verts(self._transition_verts)
+        for text in self._drag_texts:
+            text.set_animated(False)
+        self._drag_place.set_offsets(np.empty((0, 2)))
+        self._drag_transition.set_verts([])
+        self._drag_lines.set_segments([])
+        self._drag_arrows.set_verts([])
+        self._drag_edges = np.zeros(0, dtype=bool)
+        self._drag_texts = []
+        self._drag_artists = []
+        self._bg = None
+        self.canvas.draw_idle()
 
     def _setup_dragging(self):
         def on_press(event):
-            if event.inaxes != self.ax: return
-            for node in self.petri_net.pos:
-                x, y = self.petri_net.pos[node]
-                if np.hypot(event.xdata - x, event.ydata - y) < 0.1:
-                    self.dragging = node
-                    self.root.config(cursor="fleur")
-                    break
+            if event.inaxes != self.ax or not self.petri_net.node_names: return
+            points = self.petri_net.position_array
+            dx = points[:, 0] - event.xdata
+            dy = points[:, 1] - event.ydata
+            d2 = dx * dx + dy * dy
+            nearest = int(d2.argmin())
+            if d2[nearest] < 0.01:
+                self.dragging = self.petri_net.node_names[nearest]
+                self.root.config(cursor="fleur")
+                self._begin_drag(self.dragging)
                     
         def on_motion(event):
             if not self.dragging or event.inaxes != self.ax: return
-            self.petri_net.pos[self.dragging] = (event.xdata, event.ydata)
-            self._draw_network()
+            # Keep only the latest position and redraw at most once per frame (~60 Hz)
+            self._pending_motion = (event.xdata, event.ydata)
+            if self._motion_job is None:
+                self._motion_job = self.root.after(16, self._flush_motion)
             
         def on_release(event):
-            self.dragging = None
+            if self._motion_job is not None:
+                self.root.after_cancel(self._motion_job)
+                self._flush_motion()
+            if self.dragging:
+                self._end_drag(self.dragging)
+                self.dragging = None
             self.root.config(cursor="")
             
         self.canvas.mpl_connect('button_press_event', on_press)
@@ -270,35 +757,21 @@ class PetriNetApp:
 
     def generate_network(self):
         try:
-            self.petri_net = PetriNet()
+            net = PetriNet()
             
             # Parse markings
-            marking_input = self.marking_entry.get().strip()
-            markings = {}
-            if marking_input:
-                markings = dict(m.split('=') for m in marking_input.split(','))
+            markings = {name: int(tokens)
+                        for name, tokens in _parse_items(_MARK_RE, self.marking_entry.get())}
                 
-            # Add places
-            places_input = self.places_entry.get().strip()
-            if places_input:
-                for place in places_input.split(','):
-                    name = place.strip()
-                    tokens = int(markings.get(name, 0)) if name in markings else 0
-                    self.petri_net.add_place(name, tokens)
-                    
-            # Add transitions
-            transitions_input = self.transitions_entry.get().strip()
-            if transitions_input:
-                for transition in transitions_input.split(','):
-                    self.petri_net.add_transition(transition.strip())
-                    
-            # Add arcs
-            arcs_input = self.arcs_entry.get().strip()
-            if arcs_input:
-                for arc in arcs_input.split(','):
-                    src, dst = arc.strip().split('->')
-                    self.petri_net.add_arc(src.strip(), dst.strip())
-                    
+            # Parse places, transitions and arcs
+            places = _parse_names(self.places_entry.get())
+            transitions = _parse_names(self.transitions_entry.get())
+            arcs = _parse_items(_ARC_RE, self.arcs_entry.get())
+            
+            # An invalid arc aborts before the current net is replaced
+            net.bulk_add(places, transitions, arcs, markings)
+            net.auto_layout()
+            self.petri_net = net
             self._draw_network()
             
         except Exception as e:
@@ -309,20 +782,33 @@ class PetriNetApp:
             messagebox.showinfo("Info", "No network to analyze")
             return
             
-        results = f"Bounded: {'Yes' if self.petri_net.is_bounded() else 'No'}\n"
-        results += f"Live Transitions: {'Yes' if self.petri_net.has_live_transitions() else 'No'}\n\n"
-        
-        results += "Places Status:\n"
-        for name, p in self.petri_net.places.items():
-            results += f"  {name}: {p.tokens} tokens\n"
+        lines = [f"Bounded: {'Yes' if self.petri_net.is_bounded() else 'No'}",
+                 f"Live Transitions: {'Yes' if self.petri_net.has_live_transitions() else 'No'}",
+                 "",
+                 "Places Status:"]
+        lines.extend(f"  {name}: {tokens} tokens"
+                     for name, tokens in zip(self.petri_net.places, self.petri_net.marking.tolist()))
+        results = "\n".join(lines) + "\n"
             
-        # Simple analysis dialog
+        # Simple analysis dialog, built on first use and reused afterwards
+        if self._analysis_window is None:
+            self._setup_analysis_window()
+        top = self._analysis_window
+        self._results_text.config(state=tk.NORMAL)
+        self._results_text.delete("1.0", tk.END)
+        self._results_text.insert(tk.END, results)
+        self._results_text.config(state=tk.DISABLED)
+        top.deiconify()
+        top.lift()
+        top.grab_set()
+
+    def _setup_analysis_window(self):
         top = tk.Toplevel(self.root)
         top.title("Analysis")
         top.geometry("300x250")
         top.configure(bg=MinimalisticTheme.BG)
         top.transient(self.root)
-        top.grab_set()
+        top.protocol("WM_DELETE_WINDOW", self._hide_analysis_window)
         
         # Results display
         tk.Label(top, text="Analysis Results", 
@@ -330,18 +816,21 @@ class PetriNetApp:
                 fg=MinimalisticTheme.ACCENT, 
                 bg=MinimalisticTheme.BG).pack(pady=(15, 10))
                 
-        results_text = tk.Text(top, wrap=tk.WORD, height=10,
-                               bg=MinimalisticTheme.LIGHT_ACCENT, 
-                               fg=MinimalisticTheme.FG,
-                               relief=tk.FLAT, bd=0, padx=10, pady=10)
-        results_text.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
-        results_text.insert(tk.END, results)
-        results_text.config(state=tk.DISABLED)
+        self._results_text = tk.Text(top, wrap=tk.WORD, height=10,
+                                     bg=MinimalisticTheme.LIGHT_ACCENT, 
+                                     fg=MinimalisticTheme.FG,
+                                     relief=tk.FLAT, bd=0, padx=10, pady=10)
+        self._results_text.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
         
         # Close button
-        tk.Button(top, text="Close", command=top.destroy,
+        tk.Button(top, text="Close", command=self._hide_analysis_window,
                   bg=MinimalisticTheme.ACCENT, fg="white",
                   relief=tk.FLAT, bd=0, padx=20, pady=5).pack(pady=(0, 15))
+        self._analysis_window = top
+
+    def _hide_analysis_window(self):
+        self._analysis_window.grab_release()
+        self._analysis_window.withdraw()
 
     def reset_model(self):
         self.petri_net = PetriNet()
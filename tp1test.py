@@ -1,17 +1,52 @@
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import ttk, messagebox
-import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.transforms import Affine2D
+
+RESULT_CACHE_SIZE = 32
+
+
+def _lookup(names, keys):
+    """Positions of keys in a sorted name array, and which keys are present in it"""
+    ids = np.searchsorted(names, keys)
+    if not len(names):
+        return ids, np.zeros(len(keys), dtype=bool)
+    return ids, names[np.minimum(ids, len(names) - 1)] == keys
+
+
+def _liveness_kernel(in_off, in_idx, out_cnt, marking):
+    """Per-transition (enabled, live) masks from CSR input arcs and output arc counts"""
+    enabled = np.zeros(len(out_cnt), dtype=bool)
+    # AND-reduce each transition's row of marked checks; rows without inputs stay disabled
+    rows = np.flatnonzero(np.diff(in_off))
+    if rows.size:
+        enabled[rows] = np.logical_and.reduceat(marking[in_idx] > 0, in_off[rows])
+    return enabled, enabled & (out_cnt > 0)
 
 
 class PetriNetAnalyzer:
+    __slots__ = ('places', 'transitions', 'arcs', '_arc_src', '_arc_dst', 'marking',
+                 'place_color', 'transition_color', 'active_place_color', 'edge_color', 'node_size',
+                 '_marked', '_node_color_base', '_transition_list', '_place_arr', '_m',
+                 '_in_off', '_in_idx', '_out_cnt', '_key', '_cache')
+
     def __init__(self):
         self.places = set()
         self.transitions = set()
         self.arcs = []
+        self._arc_src = np.array([], dtype=str)
+        self._arc_dst = np.array([], dtype=str)
         self.marking = {}
-        self.graph = nx.DiGraph()
+        self._marked = set()
+        self._node_color_base = {}
+        # Analysis results per network content, least recently used first
+        self._key = None
+        self._cache = OrderedDict()
+        self._build_arrays()
 
         # Visualization parameters
         self.place_color = "#4E79A7"
@@ -22,40 +57,85 @@ class PetriNetAnalyzer:
 
     def load_network(self, places, transitions, arcs, marking):
         """Load network components into the analyzer with validation"""
-        self.places = set(places)
-        self.transitions = set(transitions)
-        self.arcs = [(src.strip(), dest.strip()) for src, dest in arcs]
-        self.marking = {p.strip(): int(v) for p, v in marking.items()}
-        self._validate_network()
-        self._build_graph()
-
-    def _validate_network(self):
+        # Everything is built and validated locally first so a rejected network
+        # leaves the previously loaded one (and its cached results) intact
+        places = set(places)
+        transitions = set(transitions)
+        arcs = [(src.strip(), dest.strip()) for src, dest in arcs]
+        # Column (SoA) copy of the arcs for vectorized validation and indexing
+        arc_src = np.array([src for src, _ in arcs], dtype=str)
+        arc_dst = np.array([dest for _, dest in arcs], dtype=str)
+        marking = {p.strip(): int(v) for p, v in marking.items()}
+        self._validate_network(places | transitions, places, arc_src, arc_dst, marking)
+
+        self.places = places
+        self.transitions = transitions
+        self.arcs = arcs
+        self._arc_src = arc_src
+        self._arc_dst = arc_dst
+        self.marking = marking
+        self._marked = {p for p, v in marking.items() if v > 0}
+        self._build_arrays()
+
+        # Display colour per node, resolved once per load; places win on name clashes
+        self._node_color_base = dict.fromkeys(self.transitions, self.transition_color)
+        self._node_color_base.update(
+            (p, self.active_place_color if p in self._marked else self.place_color)
+            for p in self.places)
+
+        self._key = (frozenset(self.places), frozenset(self.transitions),
+                     frozenset(self.arcs), frozenset(self.marking.items()))
+
+    def _validate_network(self, nodes, places, arc_src, arc_dst, marking):
         """Validate network structure and relationships"""
-        # Validate arc connections
-        for src, dest in self.arcs:
-            if src not in self.places and src not in self.transitions:
-                raise ValueError(f"Invalid source node in arc: {src}")
-            if dest not in self.places and dest not in self.transitions:
-                raise ValueError(f"Invalid destination node in arc: {dest}")
+        # Validate arc connections: one set difference reports every unknown endpoint
+        nodes = np.array(list(nodes), dtype=str)
+        bad = np.setdiff1d(np.concatenate([arc_src, arc_dst]), nodes)
+        if bad.size:
+            raise ValueError(f"Invalid nodes in arcs: {', '.join(bad)}")
 
         # Validate marking consistency
-        for place in self.marking:
-            if place not in self.places:
-                raise ValueError(f"Marking specified for non-existent place: {place}")
-
-    def _build_graph(self):
-        """Construct networkx graph representation with type annotations"""
-        self.graph.clear()
-        self.graph.add_nodes_from(self.places, bipartite=0, node_type='place')
-        self.graph.add_nodes_from(self.transitions, bipartite=1, node_type='transition')
-        self.graph.add_edges_from(self.arcs)
+        bad = sorted(marking.keys() - places)
+        if bad:
+            raise ValueError(f"Marking specified for non-existent places: {', '.join(bad)}")
+        limit = np.iinfo(np.int32)
+        for place, tokens in marking.items():
+            if not limit.min <= tokens <= limit.max:
+                raise ValueError(f"Marking out of range for place: {place}")
+
+    def _build_arrays(self):
+        """Index arcs and marking into the arrays the analysis kernel reads"""
+        # Ids are positions in the sorted name arrays, found with one searchsorted per column
+        self._place_arr = np.array(sorted(self.places), dtype=str)
+        transition_arr = np.array(sorted(self.transitions), dtype=str)
+        self._transition_list = transition_arr.tolist()
+        srcs, dsts = self._arc_src, self._arc_dst
+
+        # Token counts as an int32 vector indexed by place id; the extra last slot stays 0
+        # and stands in for arc sources that are not places
+        self._m = np.zeros(len(self._place_arr) + 1, dtype=np.int32)
+        marked_ids, _ = _lookup(self._place_arr, np.array(list(self.marking), dtype=str))
+        self._m[marked_ids] = list(self.marking.values())
+        src_pid, src_is_place = _lookup(self._place_arr, srcs)
+        src_tid, is_output = _lookup(transition_arr, srcs)
+        dst_tid, is_input = _lookup(transition_arr, dsts)
+        in_t = dst_tid[is_input]
+        in_src = np.where(src_is_place, src_pid, len(self._place_arr))[is_input]
+        out_t = src_tid[is_output]
+
+        # CSR input rows: transition r's input place ids are _in_idx[_in_off[r]:_in_off[r + 1]]
+        n = len(self._transition_list)
+        self._in_idx = in_src[np.argsort(in_t, kind='stable')]
+        self._in_off = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(in_t, minlength=n), out=self._in_off[1:])
+        self._out_cnt = np.bincount(out_t, minlength=n)
 
     def analyze_boundedness(self):
         """
         Check boundedness using structural analysis.
         Returns True if all places have finite capacity in initial marking.
         """
-        return all(isinstance(m, int) and m >= 0 for m in self.marking.values())
+        return self._results()[0]
 
     def analyze_liveness(self):
         """
@@ -64,30 +144,32 @@ class PetriNetAnalyzer:
         - At least one input place and one output place
         - All input places have paths from initial marking
         """
-        live_count = 0
-        for t in self.transitions:
-            inputs = {src for src, dest in self.arcs if dest == t}
-            outputs = {dest for src, dest in self.arcs if src == t}
-
-            if inputs and outputs and all(self.marking.get(p, 0) > 0 for p in inputs):
-                live_count += 1
-        return live_count / len(self.transitions) if self.transitions else 0.0
+        return self._results()[1]
 
     def get_enabled_transitions(self):
         """Identify currently enabled transitions using standard Petri net semantics"""
-        enabled = []
-        for t in self.transitions:
-            inputs = [src for src, dest in self.arcs if dest == t]
-            if inputs and all(self.marking.get(p, 0) > 0 for p in inputs):
-                enabled.append(t)
-        return enabled
+        return list(self._results()[2])
+
+    def _results(self):
+        """(bounded, liveness, enabled) for the loaded network, memoized on its contents"""
+        if self._key in self._cache:
+            self._cache.move_to_end(self._key)
+            return self._cache[self._key]
+        enabled, live = _liveness_kernel(self._in_off, self._in_idx, self._out_cnt, self._m)
+        results = (bool((self._m >= 0).all()),
+                   float(live.mean()) if live.size else 0.0,
+                   tuple(self._transition_list[i] for i in np.flatnonzero(enabled)))
+        self._cache[self._key] = results
+        if len(self._cache) > RESULT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return results
 
 
 class PetriNetGUI:
     def __init__(self, root):
         self.root = root
         self.analyzer = PetriNetAnalyzer()
-        self.current_figure = None
+        self._pending_analyze = None
 
         self._setup_ui()
         self._create_input_panel()
@@ -122,7 +204,7 @@ class PetriNetGUI:
             entry.grid(row=idx, column=1, padx=5, pady=5)
             self.entries[label.lower()] = entry
 
-        ttk.Button(input_frame, text="Analyze", command=self._analyze).grid(row=4, columnspan=2, pady=10)
+        ttk.Button(input_frame, text="Analyze", command=self._schedule_analyze).grid(row=4, columnspan=2, pady=10)
         ttk.Button(input_frame, text="Reset", command=self._reset).grid(row=5, columnspan=2, pady=10)
 
     def _create_visualization_frame(self):
@@ -132,6 +214,13 @@ class PetriNetGUI:
         self.viz_frame.grid_columnconfigure(0, weight=1)
         self.viz_frame.grid_rowconfigure(0, weight=1)
 
+        # One figure and canvas for the window's lifetime; each analysis redraws into them
+        self.figure = Figure(figsize=(10, 8))
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_axis_off()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.viz_frame)
+        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+
     def _create_results_panel(self):
         """Create analysis results display with enhanced formatting"""
         results_frame = ttk.LabelFrame(self.root, text="Analysis Results")
@@ -149,10 +238,27 @@ class PetriNetGUI:
     def _parse_inputs(self):
         """Parse and validate user inputs with comprehensive checks"""
         try:
-            places = [p.strip() for p in self.entries['places'].get().split(',') if p.strip()]
-            transitions = [t.strip() for t in self.entries['transitions'].get().split(',') if t.strip()]
-            arcs = [a.strip().split('->') for a in self.entries['arcs'].get().split(',') if a.strip()]
-            marking = dict(m.split('=') for m in self.entries['marking'].get().split(',') if m.strip())
+            places = [p for p in map(str.strip, self.entries['places'].get().split(',')) if p]
+            transitions = [t for t in map(str.strip, self.entries['transitions'].get().split(',')) if t]
+
+            # partition splits once and reports a missing separator without building a list
+            arcs = []
+            for arc in map(str.strip, self.entries['arcs'].get().split(',')):
+                if not arc:
+                    continue
+                src, sep, dest = arc.partition('->')
+                if not sep:
+                    raise ValueError(f"Arc '{arc}' is missing '->'")
+                arcs.append((src.strip(), dest.strip()))
+
+            marking = {}
+            for item in map(str.strip, self.entries['marking'].get().split(',')):
+                if not item:
+                    continue
+                place, sep, tokens = item.partition('=')
+                if not sep:
+                    raise ValueError(f"Marking '{item}' is missing '='")
+                marking[place.strip()] = tokens.strip()
 
             if not places:
                 raise ValueError("At least one place must be defined")
@@ -166,8 +272,15 @@ class PetriNetGUI:
             messagebox.showerror("Input Error", f"Invalid input format: {str(e)}")
             return None
 
+    def _schedule_analyze(self):
+        """Run the analysis 150 ms after the last request so a burst of clicks runs it once"""
+        if self._pending_analyze is not None:
+            self.root.after_cancel(self._pending_analyze)
+        self._pending_analyze = self.root.after(150, self._analyze)
+
     def _analyze(self):
         """Execute analysis pipeline with error handling"""
+        self._pending_analyze = None
         inputs = self._parse_inputs()
         if not inputs:
             return
@@ -181,41 +294,65 @@ class PetriNetGUI:
 
     def _update_visualization(self):
         """Generate interactive network visualization"""
-        if self.current_figure:
-            plt.close(self.current_figure)
-
-        fig = plt.Figure(figsize=(10, 8))
-        ax = fig.add_subplot(111)
-
-        # Create bipartite layout with optimized spacing
-        pos = nx.bipartite_layout(self.analyzer.graph, self.analyzer.places, scale=2.0)
+        ax = self.ax
+        ax.clear()
+        ax.set_axis_off()
+        # Equal scaling keeps the arrowheads (drawn in points) aligned with their arcs
+        ax.set_aspect('equal', adjustable='datalim')
+
+        # Places in the left column, transitions in the right, both in name order
+        places = sorted(self.analyzer.places)
+        transitions = sorted(self.analyzer.transitions - self.analyzer.places)
+        pos = self._two_column_layout(places, transitions)
+        nodes = list(pos)
+        xy = np.array(list(pos.values()), dtype=float).reshape(-1, 2)
+        row = {node: i for i, node in enumerate(nodes)}
+        src = xy[[row[s] for s, _ in self.analyzer.arcs]]
+        dst = xy[[row[d] for _, d in self.analyzer.arcs]]
 
         # Enhanced node styling with state indication
-        node_colors = []
-        for node in self.analyzer.graph.nodes():
-            if node in self.analyzer.places:
-                node_colors.append(self.analyzer.active_place_color
-                                   if self.analyzer.marking.get(node, 0) > 0
-                                   else self.analyzer.place_color)
+        color_of = self.analyzer._node_color_base
+        node_colors = [color_of[node] for node in nodes]
+
+        # One collection each for arcs, arrowheads and nodes rather than an artist per arc
+        ax.add_collection(LineCollection(np.stack([src, dst], axis=1),
+                                         colors=self.analyzer.edge_color, linewidths=2, zorder=1))
+        ax.add_collection(self._arrowheads(src, dst))
+        ax.scatter(xy[:, 0], xy[:, 1], s=self.analyzer.node_size, c=node_colors, zorder=2)
+        for node, (x, y) in zip(nodes, xy):
+            ax.text(x, y, node, fontsize=10, fontweight='bold', ha='center', va='center', zorder=3)
+        if len(xy):
+            # Pad by roughly a node radius; the aspect setting then widens whichever axis it needs
+            ax.update_datalim(np.vstack([xy.min(axis=0) - 0.5, xy.max(axis=0) + 0.5]))
+            ax.autoscale_view()
+        self.canvas.draw_idle()
+
+    def _arrowheads(self, src, dst, length=12.0, half_width=5.0):
+        """Arrowhead triangles sized in points, sitting on the rim of each arc's target node"""
+        vec = dst - src
+        dist = np.hypot(vec[:, 0], vec[:, 1])
+        # Self-loops have no direction to point along
+        keep = dist > 0
+        unit = vec[keep] / dist[keep, None]
+        normal = unit[:, ::-1] * (-1, 1)
+        # Scatter sizes are marker areas in points^2, so the node radius is sqrt(size) / 2
+        tip = -unit * np.sqrt(self.analyzer.node_size) / 2
+        base = tip - unit * length
+        verts = np.stack([tip, base + normal * half_width, base - normal * half_width], axis=1)
+        return PolyCollection(verts, offsets=dst[keep], offset_transform=self.ax.transData,
+                              transform=Affine2D().scale(1 / 72) + self.figure.dpi_scale_trans,
+                              facecolors=self.analyzer.edge_color, edgecolors='none', zorder=1)
+
+    def _two_column_layout(self, left, right, width=4.0, height=2.5):
+        """Spread each column evenly top to bottom; a single node sits at mid-height"""
+        pos = {}
+        for names, x in ((left, -width / 2), (right, width / 2)):
+            if len(names) > 1:
+                ys = np.linspace(height / 2, -height / 2, len(names))
             else:
-                node_colors.append(self.analyzer.transition_color)
-
-        # Draw with professional styling
-        nx.draw(self.analyzer.graph, pos, ax=ax,
-                node_color=node_colors,
-                node_size=self.analyzer.node_size,
-                edge_color=self.analyzer.edge_color,
-                width=2,
-                with_labels=True,
-                font_size=10,
-                font_weight='bold',
-                arrowsize=20)
-
-        # Embed in Tkinter with proper layout management
-        canvas = FigureCanvasTkAgg(fig, master=self.viz_frame)
-        canvas.draw()
-        canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
-        self.current_figure = fig
+                ys = np.zeros(len(names))
+            pos.update(zip(names, np.column_stack([np.full(len(names), x), ys])))
+        return pos
 
     def _update_results(self):
         """Update results display with precise formatting"""
@@ -233,15 +370,16 @@ class PetriNetGUI:
 
     def _reset(self):
         """Reset application state with proper cleanup"""
+        if self._pending_analyze is not None:
+            self.root.after_cancel(self._pending_analyze)
+            self._pending_analyze = None
         for entry in self.entries.values():
             entry.delete(0, tk.END)
         self.analyzer = PetriNetAnalyzer()
         self._update_results()
-        if self.current_figure:
-            plt.close(self.current_figure)
-            self.current_figure = None
-        for widget in self.viz_frame.winfo_children():
-            widget.destroy()
+        self.ax.clear()
+        self.ax.set_axis_off()
+        self.canvas.draw_idle()
 
 
 if __name__ == "__main__":